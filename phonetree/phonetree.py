@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import inspect
-from typing import Any, Callable, Iterator, Protocol, Sequence
+import unicodedata
+from functools import update_wrapper
+from types import CodeType
+from typing import Any, Callable, Protocol
 
+from rapidfuzz import fuzz
 from rapidfuzz.distance import Indel
+from rapidfuzz.process import extractOne
 
 __all__ = ["menu", "Ask", "Tell", "Flow"]
 
@@ -32,20 +37,27 @@ class NormalizedActionCallback(Protocol):
         ...
 
 
-def similarity(s1: str, s2: str) -> float:
+# Normalized Indel similarity between two strings, ranging from 0.0 (no similarity) to 1.0
+# (identical strings). No longer used for menu matching; kept for backward compatibility.
+similarity: Callable[[str, str], float] = Indel.normalized_similarity
+
+
+def _normalize_text(text: str) -> str:
     """
-    Find the normalized Indel similarity between two strings.
+    Normalize a text for case-insensitive matching.
 
-    :param s1: The first string to be compared
-    :param s2: The second string to be compared
-    :return: The normalized Indel similarity value between the two strings,
-             ranging from 0.0 (no similarity) to 1.0 (identical strings)
+    :param text: The text to be normalized
+    :return: The NFKC normalized and casefolded text
     """
-    # Calculate the normalized similarity using the Indel class method
-    return Indel.normalized_similarity(s1, s2)
+    # ASCII text is unchanged by NFKC and casefolds the same as it lowercases
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize("NFKC", text).casefold()
 
 
 class NextProtocol(Protocol):
+    __slots__ = ()
+
     def next(self, state: Any, ask: Ask, tell: Tell) -> tuple[Menu | Action | None, Any]:
         ...
 
@@ -61,6 +73,22 @@ class Flow:
 
 
 class Menu(NextProtocol):
+    __slots__ = (
+        "_items",
+        "_parent",
+        "_include_exit",
+        "include_exit_on_submenus",
+        "callback",
+        "_cache_items",
+        "_cache_lower",
+        "_cache_indices",
+        "_exact",
+        "_name_lens",
+        "_prompt",
+        "_frozen",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         parent: Menu | None = None,
@@ -75,34 +103,87 @@ class Menu(NextProtocol):
         :param include_exit_on_submenus: Whether to include an Exit option in submenus, defaults to False
         """
         self._items: list[tuple[str, Menu | Action]] = []
-        self.parent: Menu | None = parent
-        self.include_exit: bool = include_exit
+        self._parent: Menu | None = parent
+        self._include_exit: bool = include_exit
         self.include_exit_on_submenus: bool = include_exit_on_submenus
         self.callback: NormalizedActionCallback | None = None
+        self._cache_items: tuple[tuple[str, Menu | Action | None], ...] | None = None
+        self._cache_lower: list[str] | None = None
+        self._cache_indices: list[str] | None = None
+        self._exact: dict[str, int] | None = None
+        self._name_lens: tuple[int, int] | None = None
+        self._prompt: str | None = None
+        self._frozen: bool = False
 
     @property
-    def _items_list(self) -> Sequence[tuple[str, Menu | Action | None]]:
-        """
-        Get the list of menu items including the parent menu and / or Exit option.
+    def parent(self) -> Menu | None:
+        """The parent menu object if any, offered as the "Return to previous menu" option."""
+        return self._parent
 
-        :return: A list containing tuples with menu item names and their corresponding Menu or Action objects
-        """
-        items: list[tuple[str, Menu | Action | None]] = list(self._items)
-        if (parent := self.parent) is not None:
-            items.append(("Return to previous menu", parent))
-        if parent is None or self.include_exit:
-            items.append(("Exit", None))
-        return items
+    @parent.setter
+    def parent(self, parent: Menu | None) -> None:
+        if self._frozen:
+            raise RuntimeError("Cannot change the parent of a menu that has already been used")
+        self._parent = parent
+        self._invalidate_cache()
 
     @property
-    def _menu(self) -> Iterator[str]:
+    def include_exit(self) -> bool:
+        """Whether to include an Exit option in the menu."""
+        return self._include_exit
+
+    @include_exit.setter
+    def include_exit(self, include_exit: bool) -> None:
+        if self._frozen:
+            raise RuntimeError("Cannot change the Exit option of a menu that has already been used")
+        self._include_exit = include_exit
+        self._invalidate_cache()
+
+    def _invalidate_cache(self) -> None:
+        """Discard the cached menu items, forcing them to be rebuilt on next use."""
+        self._cache_items = None
+        self._cache_lower = None
+        self._cache_indices = None
+        self._exact = None
+        self._name_lens = None
+        self._prompt = None
+
+    def _freeze(self) -> None:
         """
-        Generator function for iterating over the menu item names with their numerical indices.
+        Freeze the menu items, so that the cached items and prompt can't go stale.
+        """
+        self._frozen = True
+        self._ensure_cache()
 
-        :return: An iterator yielding formatted menu item strings
+    def _ensure_cache(self) -> None:
+        """
+        Build the cached menu items including the parent menu and / or Exit option, their
+        normalized names, their index strings, the lookup table for exact name matches, the range
+        of name lengths and the rendered menu prompt if needed.
         """
-        for i, item in enumerate(self._items_list):
-            yield f"{i + 1}. {item[0]}"
+        if self._cache_items is not None:
+            return
+        suffix: tuple[tuple[str, Menu | Action | None], ...] = ()
+        if (parent := self._parent) is not None:
+            suffix += (("Return to previous menu", parent),)
+        if parent is None or self._include_exit:
+            suffix += (("Exit", None),)
+        items_list = tuple(self._items) + suffix
+        self._cache_items = items_list
+        self._cache_lower = [_normalize_text(name) for name, _ in items_list]
+        self._cache_indices = [str(i) for i in range(1, len(items_list) + 1)]
+
+        # Keep the first item when two items share the same normalized name
+        self._exact = {}
+        for i, lower_name in enumerate(self._cache_lower):
+            self._exact.setdefault(lower_name, i)
+        name_lens = [len(lower_name) for lower_name in self._cache_lower]
+        self._name_lens = (min(name_lens), max(name_lens))
+
+        self._prompt = "Please select an option:\n" + "\n".join(
+            f"{index_string}. {name}"
+            for index_string, (name, _) in zip(self._cache_indices, items_list)
+        )
 
     def _get_item(self, name: str) -> Menu | Action | None:
         """
@@ -111,17 +192,43 @@ class Menu(NextProtocol):
         :param name: The user's input
         :return: The Menu or Action object associated with the user's input, or raise KeyError if not found
         """
-        # Find the object with the closest text similarity to the input name
-        max_ratio, item = max((similarity(x[0].lower(), name.lower()), x) for x in self._items_list)
-        if max_ratio >= 0.5:
-            return item[1]
-
-        # Find the object by its index in the menu
-        max_ratio, index = max(
-            (similarity(str(i), name), i) for i, _ in enumerate(self._items_list, 1)
-        )
-        if max_ratio >= 0.5:
-            return self._items_list[index - 1][1]
+        self._ensure_cache()
+        items_list = self._cache_items
+        query = _normalize_text(name).strip()
+
+        # Find the object by its index in the menu if the input is a number. Numbers with more
+        # significant digits than the last index are out of range and must not be converted, as
+        # int() refuses overly long strings.
+        is_number = query.isdecimal()
+        if is_number:
+            digits = query.lstrip("0")
+            max_digits = len(self._cache_indices[-1])
+            if 0 < len(digits) <= max_digits and (index := int(digits)) <= len(items_list):
+                return items_list[index - 1][1]
+
+        # Find the object by its exact name in the menu
+        if (index := self._exact.get(query)) is not None:
+            return items_list[index][1]
+
+        # Find the object with the closest text similarity to the input name. The similarity of
+        # two strings is at most 1 - |len1 - len2| / (len1 + len2), so it can only reach 0.5 for
+        # names between a third and three times the length of the input.
+        min_len, max_len = self._name_lens
+        if min_len <= 3 * len(query) and len(query) <= 3 * max_len:
+            # No processor, so that strings are compared as normalized above on any rapidfuzz version
+            match = extractOne(
+                query, self._cache_lower, scorer=fuzz.ratio, processor=None, score_cutoff=50
+            )
+            if match is not None:
+                return items_list[match[2]][1]
+
+        # Find the object by the closest index in the menu, unless the input was already a number
+        if not is_number:
+            match = extractOne(
+                query, self._cache_indices, scorer=fuzz.ratio, processor=None, score_cutoff=50
+            )
+            if match is not None:
+                return items_list[match[2]][1]
 
         raise KeyError(name)
 
@@ -150,7 +257,10 @@ class Menu(NextProtocol):
         :param include_exit_on_submenus: Whether to include an Exit option in submenus,
             defaults to self.include_exit_on_submenus
         :return: The submenu object
+        :raises RuntimeError: If the menu has already been used
         """
+        if self._frozen:
+            raise RuntimeError("Cannot add a submenu to a menu that has already been used")
         submenu = Menu(
             parent=self,
             include_exit=include_exit
@@ -161,6 +271,7 @@ class Menu(NextProtocol):
             else self.include_exit_on_submenus,
         )
         self._items.append((name, submenu))
+        self._invalidate_cache()
         return submenu
 
     def action(
@@ -172,9 +283,13 @@ class Menu(NextProtocol):
 
         :param name: The name of the action
         :return: The action object
+        :raises RuntimeError: If the menu has already been used
         """
+        if self._frozen:
+            raise RuntimeError("Cannot add an action to a menu that has already been used")
         action = Action(parent=self)
         self._items.append((name, action))
+        self._invalidate_cache()
         return action
 
     def next(
@@ -195,8 +310,13 @@ class Menu(NextProtocol):
         if (callback := self.callback) is not None:
             state = callback(state, ask, tell, Flow(self))
 
+        # Menu items can't change once the menu is in use, but the callback may still add them
+        # the first time the menu is opened
+        if not self._frozen:
+            self._freeze()
+
         # Display the menu options to the user
-        question = "Please select an option:\n" + "\n".join(self._menu)
+        question = self._prompt
 
         while True:
             question_answer = ask(question)
@@ -237,6 +357,8 @@ def menu(
 
 
 class Action(NextProtocol):
+    __slots__ = ("parent", "callback", "__weakref__")
+
     def __init__(
         self,
         parent: Menu,
@@ -264,9 +386,10 @@ class Action(NextProtocol):
             the user.
         :return: A tuple containing the next menu object and the updated state.
         """
+        if (callback := self.callback) is None:
+            return self.parent, state
         flow = Flow(self.parent)
-        if (callback := self.callback) is not None:
-            state = callback(state, ask=ask, tell=tell, flow=flow)
+        state = callback(state, ask=ask, tell=tell, flow=flow)
         return flow.next, state
 
     def __call__(self, callback: ActionCallback) -> Action:
@@ -281,6 +404,40 @@ class Action(NextProtocol):
         return self
 
 
+# Compiled wrapper factories, indexed by the argument list the wrapper passes to the callback
+_CALLBACK_WRAPPERS: dict[str, Callable[[ActionCallback], NormalizedActionCallback]] = {}
+
+# Code objects of the compiled wrappers, used to recognize already normalized callbacks
+_WRAPPER_CODES: set[CodeType] = set()
+
+
+def _callback_wrapper_factory(
+    call_args: str,
+) -> Callable[[ActionCallback], NormalizedActionCallback]:
+    """
+    Get a factory of wrappers that call a callback with the given argument list.
+
+    The wrapper is generated from source so that the callback is called directly with the given
+    arguments, passing them positionally whenever the callback's signature allows it.
+
+    :param call_args: The argument list to call the callback with, e.g. `"state, ask, flow=flow"`.
+    :return: A function that wraps a callback into a normalized callback.
+    """
+    if (factory := _CALLBACK_WRAPPERS.get(call_args)) is not None:
+        return factory
+    source = (
+        "def factory(_cb):\n"
+        "    def normalized_callback(state, ask, tell, flow):\n"
+        f"        return _cb({call_args})\n"
+        "    return normalized_callback\n"
+    )
+    namespace: dict[str, Any] = {"__name__": __name__}
+    exec(compile(source, "<phonetree callback wrapper>", "exec"), namespace)
+    factory = _CALLBACK_WRAPPERS[call_args] = namespace["factory"]
+    _WRAPPER_CODES.add(factory(None).__code__)
+    return factory
+
+
 def normalize_callback(callback: ActionCallback) -> NormalizedActionCallback:
     """
     Normalize a given callback function to have `state`, `ask`, `tell`, and `flow` as arguments. The
@@ -291,32 +448,35 @@ def normalize_callback(callback: ActionCallback) -> NormalizedActionCallback:
     :raises ValueError: If the given callback function has unsupported number of arguments or
         an invalid signature.
     """
+    # Callbacks that were already normalized, e.g. when re-binding a menu's or an action's
+    # callback, already have the normalized signature
+    if getattr(callback, "__code__", None) in _WRAPPER_CODES:
+        return callback
+
     signature = inspect.signature(callback)
     parameters = signature.parameters
-    kwargs = []
 
-    params = list(parameters.keys())
+    params = list(parameters.values())
+    call_args = []
+    positional = True
 
-    if len(params) > 0 and params[0] not in ("ask", "tell", "flow"):
+    if len(params) > 0 and params[0].name not in ("ask", "tell", "flow"):
         params.pop(0)
-        hasState = True
-    else:
-        hasState = False
+        call_args.append("state")
 
     while params:
         param = params.pop(0)
-        if param not in ("ask", "tell", "flow"):
-            raise ValueError("Unsupported argument in callback function: {}".format(param))
-        kwargs.append(param)
-
-    def normalized_callback(state: Any, ask: Ask, tell: Tell, flow: Flow) -> Any:
-        callbackLocals = locals()
-        return callback(
-            *((state,) if hasState else ()),
-            **{k: callbackLocals[k] for k in kwargs},
+        if param.name not in ("ask", "tell", "flow"):
+            raise ValueError("Unsupported argument in callback function: {}".format(param.name))
+        positional = positional and param.kind in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
         )
+        call_args.append(param.name if positional else f"{param.name}={param.name}")
 
-    normalized_callback.__name__ = callback.__name__
-    normalized_callback.__doc__ = callback.__doc__
+    normalized_callback = _callback_wrapper_factory(", ".join(call_args))(callback)
+    update_wrapper(normalized_callback, callback)
+    # The wrapper has its own signature, which inspect.signature must not take from the callback
+    del normalized_callback.__wrapped__
 
     return normalized_callback